@@ -1,8 +1,16 @@
 import os
 import re
 import json
+import hashlib
+import time
+import functools
 import traceback
+from typing import Final
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 import streamlit as st
 # Dependências Google (apenas necessárias se usar Service Account)
 import gspread
@@ -20,39 +28,188 @@ st.set_page_config(
 st.title("🎨 Catálogo ComfyUI")
 st.caption("Modelos, LoRAs e Workflows organizados | por Sérgio Duarte")
 
+# Texto da tab "Sobre" (constante, construída uma única vez no import)
+_ABOUT_MD: Final[str] = """
+### 🎯 Objetivo
+Organizar e facilitar o acesso a:
+- Modelos e LoRAs para ComfyUI
+- Workflows testados e otimizados
+- Recomendações de parâmetros
+
+### 🧩 Como usar
+1. Navegue pelas tabs "Modelos/LoRAs" e "Workflows"
+2. Use os filtros na barra lateral
+3. Selecione um item para ver detalhes
+4. Exporte resultados em CSV
+
+### 🔄 Atualização dos dados
+Carregados diretamente do Google Sheet. Cache de 5 minutos.
+Use o botão "🔄 Recarregar dados" para forçar atualização.
+
+### 👤 Autor
+**Sérgio Duarte**  
+🌐 [sergioduarte.pt](https://sergioduarte.pt)  
+📧 fotografia@sergioduarte.pt
+"""
+
 # ====
 # UTILITÁRIOS
 # ====
+_ID_RE = re.compile(r"[A-Za-z0-9-_]{20,}")
+_URL_RE = re.compile(r"/spreadsheets/d/([A-Za-z0-9-_]+)")
+_TERM_SEP_RE = re.compile(r"[\s,]+")
+
 def extract_sheet_id(url_or_id: str) -> str:
     """
     Aceita URL completa do Google Sheet OU Sheet ID e retorna o ID.
     """
     if not url_or_id:
         return ""
+    # Caso comum: já é um ID (sem "/"), devolvido tal como está sem passar por regex
+    if "/" not in url_or_id and len(url_or_id) >= 20:
+        return url_or_id
     # Se já parece um ID puro
-    if re.fullmatch(r"[A-Za-z0-9-_]{20,}", url_or_id):
+    if _ID_RE.fullmatch(url_or_id):
         return url_or_id
     # Extrai de uma URL
-    m = re.search(r"/spreadsheets/d/([A-Za-z0-9-_]+)", url_or_id)
+    m = _URL_RE.search(url_or_id)
     return m.group(1) if m else url_or_id
 
-def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
+def normalize_grid(grid: list) -> list:
+    """
+    Ajusta cada linha da grelha à largura do cabeçalho (1ª linha), já que a API omite
+    células vazias no fim de cada linha. Aplicado logo após a leitura, para que o mesmo
+    conteúdo tenha a mesma impressão digital, venha da API ou da cache local.
+    """
+    if not grid:
+        return []
+    width = len(grid[0])
+    return [(r + [""] * (width - len(r)))[:width] for r in grid]
+
+def normalize_header(header: list) -> list:
+    """
+    Cabeçalhos em minúsculas e sem espaços extras. Nomes que só diferiam antes da
+    normalização (ex.: "Tipo" e "tipo ") ficam únicos: a 1ª ocorrência mantém o nome
+    e as seguintes recebem um sufixo ("tipo_2", ...), sem perder colunas.
+    """
+    names = []
+    seen = set()
+    for h in header:
+        name = base = h.strip().lower()
+        n = 1
+        while name in seen:
+            n += 1
+            name = f"{base}_{n}"
+        seen.add(name)
+        names.append(name)
+    return names
+
+def values_to_frame(values: list) -> pd.DataFrame:
+    """
+    Constrói um DataFrame a partir da grelha devolvida pela API (1ª linha = cabeçalhos).
+    Os cabeçalhos são normalizados (normalize_header) e as linhas ajustadas à
+    largura do cabeçalho (normalize_grid).
+    Os valores já chegam como texto e ficam em colunas string[pyarrow].
+    """
+    if not values:
+        return pd.DataFrame()
+    header = normalize_header(values[0])
+    width = len(header)
+    rows = normalize_grid(values)[1:]
+    # Colunas de texto Arrow (UTF-8 contíguo) em vez de objetos str do Python
+    columns = list(zip(*rows)) or [()] * width
+    table = pa.Table.from_arrays([pa.array(col, type=pa.string()) for col in columns], names=header)
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+def to_category(series: pd.Series, known) -> pd.Categorical:
+    """
+    Converte uma coluna de baixa cardinalidade em Categorical, para que o isin() dos
+    filtros compare códigos inteiros. Valores fora de `known` viram categorias extra
+    (nada se perde).
+    """
+    categories = list(dict.fromkeys([*known, *series.unique()]))
+    return pd.Categorical(series, categories=categories)
+
+def to_low_cardinality(df: pd.DataFrame, cols, max_ratio: float = 0.5) -> pd.DataFrame:
     """
-    Normaliza nomes de colunas para minúsculas e sem espaços extras.
+    Converte em category as colunas em que os valores distintos são no máximo
+    `max_ratio` das linhas: um dicionário pequeno + códigos inteiros em vez de uma
+    string por célula. Colunas quase únicas ficam como estão (a conversão não compensa).
     """
-    df = df.copy()
-    df.columns = [c.strip().lower() for c in df.columns]
+    for c in cols:
+        if df[c].nunique(dropna=False) <= len(df) * max_ratio:
+            df[c] = df[c].astype("category")
     return df
 
-def ensure_cols(df, cols):
+def add_search_columns(df: pd.DataFrame, cols) -> pd.DataFrame:
     """
-    Garante que todas as colunas esperadas existem.
+    Acrescenta colunas auxiliares "_<col>_lc" com o texto já em minúsculas,
+    para que os filtros não tenham de repetir o .str.lower() a cada rerun.
     """
     for c in cols:
-        if c not in df.columns:
-            df[c] = ""
+        df[f"_{c}_lc"] = df[c].str.lower()
+    return df
+
+def add_search_blob(df: pd.DataFrame, cols) -> pd.DataFrame:
+    """
+    Junta as colunas `cols` numa só coluna "_search_blob" (separadas por \x1f) e
+    passa-a a minúsculas de uma vez; a pesquisa livre percorre cada linha uma única vez.
+    """
+    blob = df[cols[0]]
+    for c in cols[1:]:
+        blob = blob + "\x1f" + df[c]
+    df["_search_blob"] = blob.str.lower()
     return df
 
+def search_terms(text: str) -> tuple:
+    """
+    Normaliza o texto da pesquisa livre uma única vez: minúsculas e separado em termos
+    por espaços ou vírgulas. Texto vazio (ou só separadores) devolve () e não filtra nada.
+    """
+    return tuple(t for t in _TERM_SEP_RE.split((text or "").lower()) if t)
+
+def arrow_contains(series: pd.Series, patt: str) -> np.ndarray:
+    """
+    Máscara booleana (NumPy) das linhas que contêm `patt`, calculada com o
+    match_substring do pyarrow diretamente sobre a coluna Arrow, sem passar pelo
+    .str do pandas. Valores nulos contam como "não contém".
+    """
+    return pc.match_substring(pa.array(series), patt).fill_null(False).to_numpy(zero_copy_only=False)
+
+def categorical_mask(df: pd.DataFrame, active: dict, mask: np.ndarray) -> np.ndarray:
+    """
+    Combina `mask` com os filtros isin() das colunas categóricas em `active`
+    ({coluna: valores escolhidos}); nas Categorical o isin() compara códigos inteiros.
+    """
+    for col, values in active.items():
+        mask &= df[col].isin(values).to_numpy(copy=False)
+    return mask
+
+def visible_columns(df: pd.DataFrame) -> list:
+    """
+    Colunas do Sheet, sem as colunas auxiliares internas (prefixo "_").
+    """
+    return [c for c in df.columns if not c.startswith("_")]
+
+def field(row: pd.Series, col: str, default="—"):
+    """
+    Valor de `col` no item selecionado (uma linha do lookup, lida sem conversão para dict);
+    devolve `default` quando a coluna não existe ou o valor está em falta (None/NaN/NA).
+    """
+    value = row.get(col)
+    return default if value is None or pd.isna(value) else value
+
+def ensure_cols(df, cols):
+    """
+    Garante que todas as colunas esperadas existem (as que faltam são acrescentadas
+    vazias, de uma só vez).
+    """
+    missing = [c for c in cols if c not in df.columns]
+    if not missing:
+        return df
+    filler = pd.DataFrame("", index=df.index, columns=missing).astype(pd.ArrowDtype(pa.string()))
+    return pd.concat([df, filler], axis=1)
+
 # ====
 # DEBUG HELPER
 # ====
@@ -111,27 +268,30 @@ def get_google_client():
     Autentica com Google Sheets usando:
     - st.secrets["gcp_service_account"] (recomendado no Streamlit Cloud), ou
     - variável de ambiente GOOGLE_CREDENTIALS (JSON string), para uso local.
+    Devolve (client, log): as mensagens de progresso vão para o log de debug em vez
+    de serem mostradas uma a uma; só os erros aparecem diretamente na página.
     """
+    log = []
     credentials_dict = None
     
     # 1) Streamlit Cloud Secrets
     if "gcp_service_account" in st.secrets:
-        st.info("🔑 Usando credenciais do Streamlit Secrets...")
+        log.append("🔑 Usando credenciais do Streamlit Secrets...")
         try:
             credentials_dict = dict(st.secrets["gcp_service_account"])
-            st.success(f"✅ Credenciais carregadas para: {credentials_dict.get('client_email', 'N/A')}")
+            log.append(f"✅ Credenciais carregadas para: {credentials_dict.get('client_email', 'N/A')}")
         except Exception as e:
             st.error(f"❌ Erro ao ler secrets: {e}")
-            return None
+            return None, log
     
     # 2) Ambiente local (opcional)
     if not credentials_dict:
-        st.warning("⚠️ Sem credenciais no Streamlit Secrets, tentando variável de ambiente...")
+        log.append("⚠️ Sem credenciais no Streamlit Secrets, tentando variável de ambiente...")
         try:
             env_json = os.environ.get("GOOGLE_CREDENTIALS", "")
             if env_json.strip():
                 credentials_dict = json.loads(env_json)
-                st.success("✅ Credenciais carregadas da variável de ambiente")
+                log.append("✅ Credenciais carregadas da variável de ambiente")
         except Exception as e:
             st.error(f"❌ Erro ao ler variável de ambiente: {e}")
     
@@ -142,11 +302,11 @@ def get_google_client():
     
     if credentials_dict:
         try:
-            st.info("🔐 Autenticando com Google...")
+            log.append("🔐 Autenticando com Google...")
             creds = Credentials.from_service_account_info(credentials_dict, scopes=scopes)
             client = gspread.authorize(creds)
-            st.success("✅ Autenticação bem-sucedida!")
-            return client
+            log.append("✅ Autenticação bem-sucedida!")
+            return client, log
         except Exception as e:
             st.error(f"❌ Erro ao autenticar Service Account: {e}")
             st.code(str(e), language="text")
@@ -156,7 +316,7 @@ def get_google_client():
                 "- Service Account desativada no Google Cloud\n"
                 "- Campos obrigatórios faltando no JSON\n"
             )
-            return None
+            return None, log
     else:
         st.error("❌ Nenhuma credencial encontrada!")
         st.info(
@@ -164,25 +324,165 @@ def get_google_client():
             "1. Vá em Settings → Secrets no Streamlit Cloud\n"
             "2. Adicione o bloco [gcp_service_account] com o JSON da Service Account\n"
         )
+        return None, log
+
+@st.cache_resource(show_spinner=False)
+def get_spreadsheet(_client, sheet_id: str):
+    """
+    Abre o Sheet uma única vez (open_by_key faz um pedido de metadados); as releituras
+    periódicas dos valores reutilizam este objeto. Erros não ficam em cache.
+    """
+    return _client.open_by_key(sheet_id)
+
+SHEET_TABS = ("modelos_loras", "workflows")
+
+ML_COLUMNS = [
+    "tipo", "nome", "base_model", "estilo_utilizacao", "dimensions_recomendadas",
+    "strength_tipica", "notas", "fonte_url", "caminho_local", "ultima_atualizacao"
+]
+WF_COLUMNS = [
+    "nome", "objetivo", "nodes_principais", "ksampler_recomendado", "dependencias",
+    "tempo_medio", "qualidade_esperada", "link", "versao", "ultima_atualizacao"
+]
+# Colunas mostradas nas tabelas: cabeçalho e largura (px) de cada uma
+# (as restantes aparecem nos detalhes do item selecionado)
+ML_TABLE_COLUMNS = {
+    "tipo": ("Tipo", 100),
+    "nome": ("Nome", 250),
+    "base_model": ("Base Model", 120),
+    "estilo_utilizacao": ("Estilo/Utilização", 200),
+    "dimensions_recomendadas": ("Dimensões Recomendadas", 150),
+    "strength_tipica": ("Strength Típica", 100),
+}
+WF_TABLE_COLUMNS = {
+    "nome": ("Nome", 250),
+    "objetivo": ("Objetivo", 300),
+    "tempo_medio": ("Tempo Médio", 100),
+    "qualidade_esperada": ("Qualidade Esperada", 150),
+    "versao": ("Versão", 100),
+}
+ML_DISPLAY_COLS = list(ML_TABLE_COLUMNS)
+WF_DISPLAY_COLS = list(WF_TABLE_COLUMNS)
+# Linhas por página nas tabelas (só a página visível é enviada ao browser)
+PAGE_SIZE = 20
+# Domínios conhecidos (opções dos filtros da barra lateral)
+TIPO_OPTIONS = ["Modelo", "LoRA"]
+BASE_MODEL_OPTIONS = ["SD 1.5", "SDXL", "FLUX", "Outro"]
+# Colunas pesquisadas pelos filtros de texto (têm uma cópia "_<col>_lc" em minúsculas)
+ML_SEARCH_COLUMNS = ("estilo_utilizacao",)
+WF_SEARCH_COLUMNS = ("objetivo",)
+# Colunas cobertas pela "Pesquisa livre" (juntas na coluna "_search_blob")
+ML_FREE_SEARCH_COLUMNS = ("nome", "notas")
+WF_FREE_SEARCH_COLUMNS = ("nome", "nodes_principais", "dependencias")
+# Colunas de texto com poucos valores distintos, guardadas como category quando compensa
+ML_CATEGORY_COLUMNS = ("estilo_utilizacao",)
+WF_CATEGORY_COLUMNS = ("objetivo", "qualidade_esperada", "versao")
+
+# Tempo de vida (segundos) da cache em memória e da cache local em disco
+CACHE_TTL = 300
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "comfyui_catalog")
+
+# ====
+# CACHE LOCAL (PARQUET)
+# ====
+def values_fingerprint(values) -> str:
+    """
+    Impressão digital do conteúdo das grelhas (chave da cache dos DataFrames).
+    """
+    return hashlib.sha1(json.dumps(values).encode("utf-8")).hexdigest()
+
+def parquet_cache_paths(sheet_id: str) -> list:
+    """
+    Ficheiros Parquet (um por folha) da cache local de um Sheet. O ID vem da caixa de
+    texto, por isso só IDs válidos (sem "/" nem "..") dão caminhos; caso contrário, [].
+    """
+    if not _ID_RE.fullmatch(sheet_id):
+        return []
+    return [os.path.join(CACHE_DIR, f"{sheet_id}.{tab}.parquet") for tab in SHEET_TABS]
+
+def read_parquet_cache(sheet_id: str):
+    """
+    Devolve as grelhas guardadas em disco se tiverem menos de CACHE_TTL segundos,
+    ou None (sem cache, cache expirada ou ilegível).
+    """
+    paths = parquet_cache_paths(sheet_id)
+    if not paths:
+        return None
+    try:
+        if any(time.time() - os.path.getmtime(p) >= CACHE_TTL for p in paths):
+            return None
+        values = []
+        for p in paths:
+            table = pq.read_table(p)
+            values.append([list(r) for r in zip(*(c.to_pylist() for c in table.columns))])
+        return tuple(values)
+    except (OSError, pa.ArrowException):
         return None
 
-@st.cache_data(ttl=300)
-def load_sheet(sheet_url_or_id: str):
+def write_parquet_cache(sheet_id: str, values):
     """
-    Carrega as folhas 'modelos_loras' e 'workflows' do Google Sheets.
+    Guarda as grelhas em disco (uma tabela de texto por folha, cabeçalho incluído).
+    Falhas de escrita são ignoradas: a cache local é só uma otimização.
+    """
+    paths = parquet_cache_paths(sheet_id)
+    if not paths:
+        return
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        for p, grid in zip(paths, values):
+            width = max((len(r) for r in grid), default=0)
+            columns = [[r[i] if i < len(r) else "" for r in grid] for i in range(width)]
+            table = pa.table({str(i): pa.array(col, type=pa.string()) for i, col in enumerate(columns)})
+            pq.write_table(table, p)
+    except (OSError, pa.ArrowException):
+        pass
+
+def clear_parquet_cache(sheet_id: str):
+    """
+    Apaga a cache local de um Sheet (usado pelo botão "Recarregar dados").
+    """
+    for p in parquet_cache_paths(sheet_id):
+        try:
+            os.remove(p)
+        except OSError:
+            pass
+
+# ====
+# LEITURA DO GOOGLE SHEET
+# ====
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _fetch_sheet_values(sheet_id: str):
+    """
+    Lê as folhas 'modelos_loras' e 'workflows' do Google Sheets.
+    Devolve (valores, impressão digital, erro): os valores são as grelhas em bruto
+    (listas de listas), pequenas e baratas de guardar em cache.
+    Num arranque a frio, usa a cache local em Parquet se ainda estiver válida.
+    As mensagens de progresso são devolvidas num log (4º elemento) para o modo debug.
     """
-    sheet_id = extract_sheet_id(sheet_url_or_id)
-    st.info(f"📋 Sheet ID extraído: `{sheet_id}`")
+    log = [f"📋 Sheet ID extraído: {sheet_id}"]
     
-    client = get_google_client()
+    values = read_parquet_cache(sheet_id)
+    if values is not None:
+        log.append("💾 Dados lidos da cache local (Parquet)")
+        return values, values_fingerprint(values), None, log
+    
+    client, auth_log = get_google_client()
+    log.extend(auth_log)
     
     if not client:
-        return pd.DataFrame(), pd.DataFrame(), "❌ Falha na autenticação (veja mensagens acima)"
+        return None, None, "❌ Falha na autenticação (veja mensagens acima)", log
     
+    # Com gspread >= 6 o pedido values:batchGet vai direto ao cliente HTTP, sem o pedido
+    # de metadados do open_by_key; versões anteriores passam pelo Spreadsheet (em cache).
+    http_client = getattr(client, "http_client", None)
     try:
-        st.info(f"📂 Abrindo Sheet com ID: {sheet_id}...")
-        sh = client.open_by_key(sheet_id)
-        st.success(f"✅ Sheet aberto: {sh.title}")
+        if http_client is not None:
+            batch_get = functools.partial(http_client.values_batch_get, sheet_id)
+        else:
+            log.append(f"📂 Abrindo Sheet com ID: {sheet_id}...")
+            sh = get_spreadsheet(client, sheet_id)
+            log.append(f"✅ Sheet aberto: {sh.title}")
+            batch_get = sh.values_batch_get
     except PermissionError as e:
         error_msg = f"❌ PermissionError ao abrir Sheet"
         st.error(error_msg)
@@ -194,13 +494,13 @@ def load_sheet(sheet_url_or_id: str):
             "- Permissões insuficientes no Google Cloud Console\n"
             "- APIs não ativadas no projeto\n"
         )
-        return pd.DataFrame(), pd.DataFrame(), error_msg
+        return None, None, error_msg, log
     except gspread.exceptions.APIError as e:
         error_msg = f"❌ Erro da API do Google: {e.response.status_code}"
         st.error(error_msg)
         st.code(f"Status: {e.response.status_code}\nResposta: {e.response.text}", language="text")
         st.code(traceback.format_exc(), language="text")
-        return pd.DataFrame(), pd.DataFrame(), error_msg
+        return None, None, error_msg, log
     except gspread.exceptions.SpreadsheetNotFound:
         error_msg = f"❌ Sheet não encontrado! ID: {sheet_id}"
         st.error(error_msg)
@@ -210,7 +510,7 @@ def load_sheet(sheet_url_or_id: str):
             "- O Sheet não foi partilhado com a Service Account\n"
             "- O ID está incorreto\n"
         )
-        return pd.DataFrame(), pd.DataFrame(), error_msg
+        return None, None, error_msg, log
     except Exception as e:
         error_msg = f"❌ Erro inesperado: {type(e).__name__}"
         st.error(error_msg)
@@ -223,83 +523,239 @@ def load_sheet(sheet_url_or_id: str):
             "- O Sheet foi partilhado com o email da Service Account\n"
             "- O Sheet não foi apagado ou movido\n"
         )
-        return pd.DataFrame(), pd.DataFrame(), error_msg
+        return None, None, error_msg, log
     
-    # Carrega folhas
+    # Carrega as duas folhas num único pedido (values:batchGet)
     try:
-        st.info("📄 Carregando folha 'modelos_loras'...")
-        ws_ml = sh.worksheet("modelos_loras")
-        st.success("✅ Folha 'modelos_loras' encontrada")
-    except Exception as e:
-        error_msg = f"❌ Folha 'modelos_loras' não encontrada"
-        st.error(error_msg)
-        st.code(f"Erro: {str(e)}", language="text")
-        st.code(traceback.format_exc(), language="text")
-        return pd.DataFrame(), pd.DataFrame(), error_msg
-    
-    try:
-        st.info("📄 Carregando folha 'workflows'...")
-        ws_wf = sh.worksheet("workflows")
-        st.success("✅ Folha 'workflows' encontrada")
-    except Exception as e:
-        error_msg = f"❌ Folha 'workflows' não encontrada"
+        log.append(f"📊 Lendo folhas 'modelos_loras' e 'workflows' do Sheet {sheet_id}...")
+        result = batch_get(
+            # Só o nome da folha: a API devolve todo o intervalo usado (sem limite de colunas)
+            ranges=list(SHEET_TABS),
+            params={"majorDimension": "ROWS"},
+        )
+        value_ranges = result.get("valueRanges", [])
+        values = tuple(normalize_grid(vr.get("values", [])) for vr in value_ranges)
+        log.append(
+            f"✅ Dados carregados: {max(len(values[0]) - 1, 0)} modelos/LoRAs, "
+            f"{max(len(values[1]) - 1, 0)} workflows"
+        )
+    except gspread.exceptions.APIError as e:
+        if e.response.status_code == 404:
+            error_msg = f"❌ Sheet não encontrado! ID: {sheet_id}"
+        elif e.response.status_code == 403:
+            error_msg = "❌ Sem permissão para ler o Sheet (partilhe-o com o email da Service Account)"
+        else:
+            error_msg = f"❌ Folhas {', '.join(repr(n) for n in SHEET_TABS)} não encontradas ou ilegíveis"
         st.error(error_msg)
-        st.code(f"Erro: {str(e)}", language="text")
+        st.code(f"Status: {e.response.status_code}\nResposta: {e.response.text}", language="text")
         st.code(traceback.format_exc(), language="text")
-        return pd.DataFrame(), pd.DataFrame(), error_msg
-    
-    try:
-        st.info("📊 Lendo dados...")
-        df_ml = pd.DataFrame(ws_ml.get_all_records()).fillna("")
-        df_wf = pd.DataFrame(ws_wf.get_all_records()).fillna("")
-        st.success(f"✅ Dados carregados: {len(df_ml)} modelos/LoRAs, {len(df_wf)} workflows")
+        return None, None, error_msg, log
     except Exception as e:
         error_msg = f"❌ Erro ao ler dados"
         st.error(error_msg)
         st.code(f"Erro: {str(e)}", language="text")
         st.code(traceback.format_exc(), language="text")
-        return pd.DataFrame(), pd.DataFrame(), error_msg
-    
-    # Normalização
-    df_ml = normalize_columns(df_ml).astype(str)
-    df_wf = normalize_columns(df_wf).astype(str)
+        return None, None, error_msg, log
     
-    return df_ml, df_wf, None
+    write_parquet_cache(sheet_id, values)
+    return values, values_fingerprint(values), None, log
+
+@st.cache_resource(ttl=CACHE_TTL, show_spinner=False, max_entries=4)
+def _build_frames(fingerprint: str, _values):
+    """
+    Constrói os DataFrames a partir das grelhas em bruto.
+    Fica em cache pela impressão digital do conteúdo, por isso os DataFrames
+    não são copiados nem re-hasheados a cada rerun (são só de leitura). As versões
+    antigas (dados editados entretanto) saem da cache pelo TTL e pelo limite de entradas.
+    """
+    values_ml, values_wf = _values
+    df_ml = ensure_cols(values_to_frame(values_ml), ML_COLUMNS)
+    df_wf = ensure_cols(values_to_frame(values_wf), WF_COLUMNS)
+    df_ml["tipo"] = to_category(df_ml["tipo"], TIPO_OPTIONS)
+    df_ml["base_model"] = to_category(df_ml["base_model"], BASE_MODEL_OPTIONS)
+    add_search_columns(df_ml, ML_SEARCH_COLUMNS)
+    add_search_columns(df_wf, WF_SEARCH_COLUMNS)
+    add_search_blob(df_ml, ML_FREE_SEARCH_COLUMNS)
+    add_search_blob(df_wf, WF_FREE_SEARCH_COLUMNS)
+    # Depois das colunas de pesquisa, que continuam como strings
+    to_low_cardinality(df_ml, ML_CATEGORY_COLUMNS)
+    to_low_cardinality(df_wf, WF_CATEGORY_COLUMNS)
+    return df_ml, df_wf
+
+def load_sheet(sheet_url_or_id: str):
+    """
+    Carrega as folhas 'modelos_loras' e 'workflows' do Google Sheets.
+    Devolve (df_ml, df_wf, versão dos dados, erro, log de debug); a versão é a
+    impressão digital do conteúdo e serve de chave às caches que dependem dos dados.
+    """
+    values, fingerprint, error, log = _fetch_sheet_values(extract_sheet_id(sheet_url_or_id))
+    if error:
+        return pd.DataFrame(), pd.DataFrame(), None, error, log
+    df_ml, df_wf = _build_frames(fingerprint, values)
+    return df_ml, df_wf, fingerprint, None, log
 
 def filter_modelos_loras(df, filtro_tipo, filtro_base, filtro_estilo, filtro_search):
-    filtered = df.copy()
-    if filtro_tipo:
-        filtered = filtered[filtered["tipo"].isin(filtro_tipo)]
-    if filtro_base:
-        filtered = filtered[filtered["base_model"].isin(filtro_base)]
+    # Sem filtros (estado inicial): devolve o próprio DataFrame, que só é lido a jusante
+    terms = search_terms(filtro_search)
+    if not (filtro_tipo or filtro_base or filtro_estilo or terms):
+        return df
+    # Uma única máscara NumPy (sem alinhamento de índices), aplicada uma só vez no fim
+    # com iloc; o índice original fica, já que as tabelas o escondem e o detalhe usa "nome"
+    mask = np.ones(len(df), dtype=bool)
     if filtro_estilo:
-        filtered = filtered[filtered["estilo_utilizacao"].str.contains(
-            filtro_estilo, case=False, na=False, regex=False
-        )]
-    if filtro_search:
-        patt = filtro_search.lower()
-        mask = (
-            filtered["nome"].str.lower().str.contains(patt, na=False, regex=False) |
-            filtered["notas"].str.lower().str.contains(patt, na=False, regex=False)
-        )
-        filtered = filtered[mask]
-    return filtered.reset_index(drop=True)
+        mask &= arrow_contains(df["_estilo_utilizacao_lc"], filtro_estilo.lower())
+    # Vários termos: a linha tem de conter todos (em qualquer ordem)
+    for term in terms:
+        mask &= arrow_contains(df["_search_blob"], term)
+    active = {col: values for col, values in (("tipo", filtro_tipo), ("base_model", filtro_base)) if values}
+    if active:
+        mask = categorical_mask(df, active, mask)
+    return df.iloc[mask]
 
 def filter_workflows(df, filtro_objetivo, filtro_search):
-    filtered = df.copy()
+    terms = search_terms(filtro_search)
+    if not (filtro_objetivo or terms):
+        return df
+    mask = np.ones(len(df), dtype=bool)
     if filtro_objetivo:
-        filtered = filtered[filtered["objetivo"].str.contains(
-            filtro_objetivo, case=False, na=False, regex=False
-        )]
-    if filtro_search:
-        patt = filtro_search.lower()
-        mask = (
-            filtered["nome"].str.lower().str.contains(patt, na=False, regex=False) |
-            filtered["nodes_principais"].str.lower().str.contains(patt, na=False, regex=False) |
-            filtered["dependencias"].str.lower().str.contains(patt, na=False, regex=False)
+        mask &= arrow_contains(df["_objetivo_lc"], filtro_objetivo.lower())
+    # Vários termos: a linha tem de conter todos (em qualquer ordem)
+    for term in terms:
+        mask &= arrow_contains(df["_search_blob"], term)
+    return df.iloc[mask]
+
+@st.cache_resource(ttl=CACHE_TTL, show_spinner=False, max_entries=32)
+def _cached_filter_ml(data_version, tipo, base, estilo, search, _df):
+    """
+    filter_modelos_loras em cache pelos valores dos filtros (e versão dos dados): reruns
+    que não mexem nos filtros reutilizam o resultado. Os resultados são só de leitura.
+    """
+    return filter_modelos_loras(_df, tipo, base, estilo, search)
+
+@st.cache_resource(ttl=CACHE_TTL, show_spinner=False, max_entries=32)
+def _cached_filter_wf(data_version, objetivo, search, _df):
+    """
+    filter_workflows em cache pelos valores dos filtros (e versão dos dados).
+    """
+    return filter_workflows(_df, objetivo, search)
+
+@functools.lru_cache(maxsize=128)
+def _safe_json(text: str):
+    """
+    JSON interpretado (ou None se o texto não for JSON válido), em cache por texto.
+    O resultado é partilhado entre reruns sem cópia, por isso não deve ser alterado.
+    """
+    try:
+        return json.loads(text)
+    except Exception:
+        return None
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False, max_entries=16)
+def _csv_bytes(key: tuple, _df: pd.DataFrame) -> bytes:
+    """
+    CSV (UTF-8) de um resultado filtrado. `key` (versão dos dados + filtros) identifica
+    o resultado, para o DataFrame não ser hasheado nem reexportado a cada rerun.
+    """
+    return _df[visible_columns(_df)].to_csv(index=False).encode("utf-8")
+
+@st.cache_resource(ttl=CACHE_TTL, show_spinner=False, max_entries=32)
+def _lookup_by_name(key: tuple, _df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Resultado filtrado indexado por "nome", para obter o item selecionado com um .loc
+    (com nomes repetidos fica a primeira ocorrência). Em cache pela assinatura `key`.
+    """
+    return _df[~_df["nome"].duplicated()].set_index("nome", drop=False)
+
+@st.cache_resource(ttl=CACHE_TTL, show_spinner=False, max_entries=32)
+def _display_view(key: tuple, _df: pd.DataFrame, cols: tuple) -> pd.DataFrame:
+    """
+    Resultado filtrado reduzido às colunas da tabela, projetado uma vez por assinatura
+    `key`; cada rerun só pagina esta vista em vez de voltar a selecionar as colunas.
+    """
+    return _df.loc[:, list(cols)]
+
+def tab_bundle(prefix: str, key: tuple, build_filtered, display_cols) -> dict:
+    """
+    Artefactos de uma tab (resultado filtrado, lookup por nome e vista da tabela) guardados
+    em st.session_state com a assinatura dos filtros (`key`). Enquanto a assinatura não
+    muda (ex.: só se escolheu outro item), são reutilizados sem consultar nenhuma cache.
+    """
+    state_key = f"{prefix}_bundle"
+    bundle = st.session_state.get(state_key)
+    if bundle is None or bundle["key"] != key:
+        filtered = build_filtered()
+        bundle = st.session_state[state_key] = {
+            "key": key,
+            "filtered": filtered,
+            "lookup": _lookup_by_name(key, filtered),
+            "view": _display_view(key, filtered, tuple(display_cols)),
+        }
+    return bundle
+
+def _change_page(page_key: str, delta: int):
+    st.session_state[page_key] += delta
+
+def current_page(prefix: str, key: tuple, df: pd.DataFrame, page_size: int = PAGE_SIZE):
+    """
+    Devolve (linhas da página atual, nº da página, nº de páginas). A página volta
+    ao início sempre que a assinatura dos filtros (`key`) muda.
+    """
+    page_key = f"{prefix}_page"
+    if st.session_state.get(f"{page_key}_key") != key:
+        st.session_state[page_key] = 0
+        st.session_state[f"{page_key}_key"] = key
+    n_pages = max(-(-len(df) // page_size), 1)
+    page = min(st.session_state[page_key], n_pages - 1)
+    return df.iloc[page * page_size:(page + 1) * page_size], page, n_pages
+
+def page_controls(prefix: str, page: int, n_pages: int):
+    """
+    Botões anterior/seguinte da tabela paginada (só quando há mais de uma página).
+    """
+    if n_pages <= 1:
+        return
+    page_key = f"{prefix}_page"
+    col_prev, col_info, col_next = st.columns([1, 2, 1])
+    with col_prev:
+        st.button("◀ Anterior", key=f"{prefix}_prev", disabled=page == 0, use_container_width=True,
+                  on_click=_change_page, args=(page_key, -1))
+    with col_info:
+        st.caption(f"Página {page + 1} de {n_pages}")
+    with col_next:
+        st.button("Seguinte ▶", key=f"{prefix}_next", disabled=page >= n_pages - 1, use_container_width=True,
+                  on_click=_change_page, args=(page_key, 1))
+
+def render_table(page_df: pd.DataFrame, columns: dict):
+    """
+    Mostra a página atual da tabela, com o cabeçalho e a largura definidos em `columns`.
+    """
+    st.dataframe(
+        page_df,
+        use_container_width=True,
+        height=350,
+        hide_index=True,
+        column_config={
+            col: st.column_config.Column(label, width=width)
+            for col, (label, width) in columns.items()
+        },
+    )
+
+def csv_export(prefix: str, key: tuple, df: pd.DataFrame, file_name: str):
+    """
+    Exportação em dois passos: o CSV só é gerado quando o utilizador clica em
+    "Preparar CSV" e é descartado quando a assinatura dos filtros (`key`) muda.
+    """
+    state_key = f"csv_{prefix}"
+    if st.session_state.get(f"{state_key}_key") != key:
+        st.session_state.pop(state_key, None)
+    if state_key not in st.session_state:
+        if st.button("📥 Preparar CSV", key=f"prep_{prefix}", use_container_width=True):
+            st.session_state[state_key] = _csv_bytes(key, df)
+            st.session_state[f"{state_key}_key"] = key
+    if state_key in st.session_state:
+        st.download_button(
+            "📥 Exportar CSV", st.session_state[state_key], file_name, "text/csv", use_container_width=True
         )
-        filtered = filtered[mask]
-    return filtered.reset_index(drop=True)
 
 # ====
 # ENTRADA: Sheet URL/ID
@@ -315,6 +771,7 @@ with st.sidebar:
     colA, colB = st.columns(2)
     with colA:
         if st.button("🔄 Recarregar dados", use_container_width=True):
+            clear_parquet_cache(extract_sheet_id(st.session_state["sheet_url_input"]))
             st.cache_data.clear()
             st.cache_resource.clear()
             st.rerun()
@@ -326,8 +783,8 @@ with st.sidebar:
     
     st.markdown("---")
     st.subheader("🔎 Filtros - Modelos/LoRAs")
-    filtro_tipo = st.multiselect("Tipo", ["Modelo", "LoRA"], default=[])
-    filtro_base = st.multiselect("Base Model", ["SD 1.5", "SDXL", "FLUX", "Outro"], default=[])
+    filtro_tipo = st.multiselect("Tipo", TIPO_OPTIONS, default=[])
+    filtro_base = st.multiselect("Base Model", BASE_MODEL_OPTIONS, default=[])
     filtro_estilo = st.text_input("Estilo/Utilização contém", "", placeholder="ex: Retrato, Arquitetura...")
     filtro_search_ml = st.text_input("Pesquisa livre (nome/notas)", "", placeholder="ex: realistic, portrait...")
     
@@ -340,197 +797,160 @@ with st.sidebar:
 # CARREGAR DADOS
 # ====
 with st.spinner("📥 Carregando dados do Google Sheet..."):
-    df_ml, df_wf, error = load_sheet(st.session_state["sheet_url_input"])
+    df_ml, df_wf, data_version, error, debug_log = load_sheet(st.session_state["sheet_url_input"])
+
+if show_debug and debug_log:
+    with st.expander("🐛 Log de carregamento"):
+        st.code("\n".join(debug_log), language="text")
 
 if error:
     st.error(f"❌ {error}")
     st.stop()
 
-# ====
-# VALIDAR COLUNAS
-# ====
-df_ml = ensure_cols(df_ml, [
-    "tipo", "nome", "base_model", "estilo_utilizacao", "dimensions_recomendadas",
-    "strength_tipica", "notas", "fonte_url", "caminho_local", "ultima_atualizacao"
-])
+# Assinatura (versão dos dados + filtros) de cada tab: chave das caches dos resultados filtrados
+ml_key = ("ml", data_version, tuple(filtro_tipo), tuple(filtro_base), filtro_estilo, filtro_search_ml)
+wf_key = ("wf", data_version, filtro_objetivo, filtro_search_wf)
 
-df_wf = ensure_cols(df_wf, [
-    "nome", "objetivo", "nodes_principais", "ksampler_recomendado", "dependencias",
-    "tempo_medio", "qualidade_esperada", "link", "versao", "ultima_atualizacao"
-])
+# Resultados filtrados: dependem só da sidebar, por isso ficam no corpo principal
+bundle_ml = tab_bundle("ml", ml_key, lambda: _cached_filter_ml(
+    data_version, tuple(filtro_tipo), tuple(filtro_base), filtro_estilo, filtro_search_ml, df_ml
+), ML_DISPLAY_COLS)
+bundle_wf = tab_bundle("wf", wf_key, lambda: _cached_filter_wf(
+    data_version, filtro_objetivo, filtro_search_wf, df_wf
+), WF_DISPLAY_COLS)
 
 # ====
-# TABS
+# RENDER DAS TABS
 # ====
-tab1, tab2, tab3 = st.tabs(["📦 Modelos/LoRAs", "⚡ Workflows", "ℹ️ Sobre"])
-
-with tab1:
+# Cada tab é um fragmento: paginação, seleção de detalhe e exportação CSV
+# re-executam só a própria tab, sem repetir o carregamento nem as outras tabs.
+@st.fragment
+def render_tab_modelos(df_ml, bundle):
     st.subheader("📦 Modelos e LoRAs")
-    filtered_ml = filter_modelos_loras(df_ml, filtro_tipo, filtro_base, filtro_estilo, filtro_search_ml)
+    filtered_ml, ml_key = bundle["filtered"], bundle["key"]
     
     col1, col2 = st.columns([3, 1])
     with col1:
         st.caption(f"✅ {len(filtered_ml)} de {len(df_ml)} itens encontrados")
     with col2:
         if len(filtered_ml) > 0:
-            csv = filtered_ml.to_csv(index=False).encode("utf-8")
-            st.download_button("📥 Exportar CSV", csv, "modelos_loras_filtrados.csv", "text/csv", use_container_width=True)
+            csv_export("ml", ml_key, filtered_ml, "modelos_loras_filtrados.csv")
     
     if len(filtered_ml) > 0:
-        column_config = {
-            "tipo": st.column_config.Column("Tipo", width=100),
-            "nome": st.column_config.Column("Nome", width=250),
-            "base_model": st.column_config.Column("Base Model", width=120),
-            "estilo_utilizacao": st.column_config.Column("Estilo/Utilização", width=200),
-            "dimensions_recomendadas": st.column_config.Column("Dimensões Recomendadas", width=150),
-            "strength_tipica": st.column_config.Column("Strength Típica", width=100),
-            "notas": st.column_config.Column("Notas", width=300),
-            "fonte_url": st.column_config.Column("Fonte URL", width=200),
-            "caminho_local": st.column_config.Column("Caminho Local", width=200),
-            "ultima_atualizacao": st.column_config.Column("Última Atualização", width=120),
-        }
-        
-        st.dataframe(
-            filtered_ml[[
-                "tipo", "nome", "base_model", "estilo_utilizacao", "dimensions_recomendadas",
-                "strength_tipica", "notas", "fonte_url", "caminho_local", "ultima_atualizacao"
-            ]],
-            use_container_width=True,
-            height=350,
-            column_config=column_config
-        )
+        page_ml, page, n_pages = current_page("ml", ml_key, bundle["view"])
+        render_table(page_ml, ML_TABLE_COLUMNS)
+        page_controls("ml", page, n_pages)
     
         st.markdown("---")
         st.subheader("🔎 Detalhes")
-        nomes = filtered_ml["nome"].tolist()
+        nomes = filtered_ml["nome"]
         sel = st.selectbox("Selecione um item:", nomes, key="ml_sel")
-        row = filtered_ml[filtered_ml["nome"] == sel].iloc[0].to_dict()
+        row = bundle["lookup"].loc[sel]
         
         col1, col2, col3 = st.columns(3)
         with col1:
-            st.metric("Tipo", row.get("tipo", "—"))
-            st.metric("Base Model", row.get("base_model", "—"))
-            st.metric("Estilo/Utilização", row.get("estilo_utilizacao", "—"))
+            st.metric("Tipo", field(row, "tipo"))
+            st.metric("Base Model", field(row, "base_model"))
+            st.metric("Estilo/Utilização", field(row, "estilo_utilizacao"))
         with col2:
-            st.metric("Dimensions", row.get("dimensions_recomendadas", "—"))
-            st.metric("Strength típica", row.get("strength_tipica", "—"))
-            st.metric("Última atualização", row.get("ultima_atualizacao", "—"))
+            st.metric("Dimensions", field(row, "dimensions_recomendadas"))
+            st.metric("Strength típica", field(row, "strength_tipica"))
+            st.metric("Última atualização", field(row, "ultima_atualizacao"))
         with col3:
-            caminho = row.get("caminho_local", "")
+            caminho = field(row, "caminho_local", "")
             if caminho:
                 st.text("Caminho local:")
                 st.code(caminho)
-            fonte = row.get("fonte_url", "")
+            fonte = field(row, "fonte_url", "")
             if fonte and fonte.startswith("http"):
                 st.markdown(f"🔗 [Abrir fonte/URL]({fonte})")
             
-            notas = row.get("notas", "")
+            notas = field(row, "notas", "")
             if notas:
                 st.markdown("**📝 Notas:**")
                 st.info(notas)
     else:
         st.warning("⚠️ Nenhum item encontrado com os filtros atuais")
 
-with tab2:
+
+@st.fragment
+def render_tab_workflows(df_wf, bundle):
     st.subheader("⚡ Workflows")
-    filtered_wf = filter_workflows(df_wf, filtro_objetivo, filtro_search_wf)
+    filtered_wf, wf_key = bundle["filtered"], bundle["key"]
     
     col1, col2 = st.columns([3, 1])
     with col1:
         st.caption(f"✅ {len(filtered_wf)} de {len(df_wf)} workflows encontrados")
     with col2:
         if len(filtered_wf) > 0:
-            csv = filtered_wf.to_csv(index=False).encode("utf-8")
-            st.download_button("📥 Exportar CSV", csv, "workflows_filtrados.csv", "text/csv", use_container_width=True)
+            csv_export("wf", wf_key, filtered_wf, "workflows_filtrados.csv")
     
     if len(filtered_wf) > 0:
-        column_config_wf = {
-            "nome": st.column_config.Column("Nome", width=250),
-            "objetivo": st.column_config.Column("Objetivo", width=300),
-            "nodes_principais": st.column_config.Column("Nodes Principais", width=300),
-            "ksampler_recomendado": st.column_config.Column("KSampler Recomendado", width=150),
-            "dependencias": st.column_config.Column("Dependências", width=200),
-            "tempo_medio": st.column_config.Column("Tempo Médio", width=100),
-            "qualidade_esperada": st.column_config.Column("Qualidade Esperada", width=150),
-            "link": st.column_config.Column("Link", width=200),
-            "versao": st.column_config.Column("Versão", width=100),
-            "ultima_atualizacao": st.column_config.Column("Última Atualização", width=120),
-        }
-        
-        st.dataframe(
-            filtered_wf[[
-                "nome", "objetivo", "nodes_principais", "ksampler_recomendado", "dependencias",
-                "tempo_medio", "qualidade_esperada", "link", "versao", "ultima_atualizacao"
-            ]],
-            use_container_width=True,
-            height=350,
-            column_config=column_config_wf
-        )
+        page_wf, page, n_pages = current_page("wf", wf_key, bundle["view"])
+        render_table(page_wf, WF_TABLE_COLUMNS)
+        page_controls("wf", page, n_pages)
     
         st.markdown("---")
         st.subheader("🔎 Detalhes do Workflow")
-        nomes = filtered_wf["nome"].tolist()
+        nomes = filtered_wf["nome"]
         sel = st.selectbox("Selecione um workflow:", nomes, key="wf_sel")
-        row = filtered_wf[filtered_wf["nome"] == sel].iloc[0].to_dict()
+        row = bundle["lookup"].loc[sel]
         
         col1, col2, col3 = st.columns(3)
         with col1:
-            st.metric("Objetivo", row.get("objetivo", "—"))
-            st.metric("Versão", row.get("versao", "—"))
-            st.metric("Última atualização", row.get("ultima_atualizacao", "—"))
+            st.metric("Objetivo", field(row, "objetivo"))
+            st.metric("Versão", field(row, "versao"))
+            st.metric("Última atualização", field(row, "ultima_atualizacao"))
         with col2:
-            st.metric("Tempo médio", row.get("tempo_medio", "—"))
-            st.metric("Qualidade esperada", row.get("qualidade_esperada", "—"))
+            st.metric("Tempo médio", field(row, "tempo_medio"))
+            st.metric("Qualidade esperada", field(row, "qualidade_esperada"))
         with col3:
-            link = row.get("link", "")
+            link = field(row, "link", "")
             if link:
                 st.text("Link/Caminho:")
                 st.code(link)
             
-            deps = row.get("dependencias", "")
+            deps = field(row, "dependencias", "")
             if deps:
                 st.markdown("**📦 Dependências:**")
                 st.info(deps)
             
-            nodes = row.get("nodes_principais", "")
+            nodes = field(row, "nodes_principais", "")
             if nodes:
                 st.markdown("**🛠️ Nodes principais:**")
                 st.code(nodes)
             
-            ks = row.get("ksampler_recomendado", "")
+            ks = field(row, "ksampler_recomendado", "")
             if ks:
                 st.markdown("**⚙️ KSampler recomendado:**")
-                try:
-                    st.json(json.loads(ks))
-                except Exception:
+                parsed = _safe_json(ks)
+                if parsed is not None:
+                    st.json(parsed)
+                else:
                     st.code(ks, language="json")
     else:
         st.warning("⚠️ Nenhum workflow encontrado com os filtros atuais")
 
-with tab3:
-    st.subheader("ℹ️ Sobre este Catálogo")
-    st.markdown("""
-### 🎯 Objetivo
-Organizar e facilitar o acesso a:
-- Modelos e LoRAs para ComfyUI
-- Workflows testados e otimizados
-- Recomendações de parâmetros
 
-### 🧩 Como usar
-1. Navegue pelas tabs "Modelos/LoRAs" e "Workflows"
-2. Use os filtros na barra lateral
-3. Selecione um item para ver detalhes
-4. Exporte resultados em CSV
-
-### 🔄 Atualização dos dados
-Carregados diretamente do Google Sheet. Cache de 5 minutos.
-Use o botão "🔄 Recarregar dados" para forçar atualização.
-
-### 👤 Autor
-**Sérgio Duarte**  
-🌐 [sergioduarte.pt](https://sergioduarte.pt)  
-📧 fotografia@sergioduarte.pt
-""")
+@st.fragment
+def render_tab_sobre():
+    st.subheader("ℹ️ Sobre este Catálogo")
+    st.markdown(_ABOUT_MD)
     
     st.markdown("---")
     st.caption("🎨 Catálogo ComfyUI | Desenvolvido com Streamlit | © 2025 Sérgio Duarte")
+
+
+# ====
+# TABS
+# ====
+tab1, tab2, tab3 = st.tabs(["📦 Modelos/LoRAs", "⚡ Workflows", "ℹ️ Sobre"])
+
+with tab1:
+    render_tab_modelos(df_ml, bundle_ml)
+
+with tab2:
+    render_tab_workflows(df_wf, bundle_wf)
+
+with tab3:
+    render_tab_sobre()